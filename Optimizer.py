@@ -100,57 +100,72 @@
 #         print(a)
 
 
+import numpy as np
 import pandas as pd
+from scipy.optimize import linear_sum_assignment
+
+# Finite stand-in for "not allowed" so the LAP solver stays well-behaved
+INFEASIBLE_COST = 1e12
 
 
 # ---------------------------------------------------------
 # Load the predictions locally (no S3 needed)
 # ---------------------------------------------------------
 def load_predictions_local(csv_path: str) -> pd.DataFrame:
-    return pd.read_csv(csv_path)
+    return pd.read_csv(
+        csv_path,
+        engine="pyarrow",
+        usecols=["carrier_id", "job_id", "p90_time_min", "carrier_hours_worked"],
+    )
 
 
 # ---------------------------------------------------------
 # Assign jobs based on constraints
 # ---------------------------------------------------------
 def assign_jobs(df: pd.DataFrame, max_hours=9.0):
-    assignments = []
-    available_carriers = set(df["carrier_id"].unique())
-
-    for job_id, job_group in df.groupby("job_id"):
-
-        # Only carriers that haven't been assigned yet
-        job_group = job_group[job_group["carrier_id"].isin(available_carriers)]
-
-        # Check work-hour constraint
-        job_group = job_group.copy()
-        job_group["can_work"] = (
-            job_group["carrier_hours_worked"] + (job_group["p90_time_min"] / 60.0)
-        ) <= max_hours
-
-        valid = job_group[job_group["can_work"]]
-
-        if valid.empty:
-            assignments.append({
-                "job_id": job_id,
-                "carrier_id": None,
-                "reason": "No eligible carriers under 9-hour limit"
-            })
-            continue
-
-        # Pick fastest carrier
-        best_row = valid.loc[valid["p90_time_min"].idxmin()]
-
-        assignments.append({
-            "job_id": best_row["job_id"],
-            "carrier_id": best_row["carrier_id"],
-            "p90_time_min": best_row["p90_time_min"]
-        })
-
-        # Remove carrier from future assignments
-        available_carriers.remove(best_row["carrier_id"])
-
-    return assignments
+    # A (job, carrier) pair may appear more than once: keep its fastest
+    # eligible row so time and hours stay paired
+    can_work = (df["carrier_hours_worked"] + df["p90_time_min"] / 60.0) <= max_hours
+    df = (
+        df.assign(_cannot_work=~can_work)
+        .sort_values(["_cannot_work", "p90_time_min"], kind="stable")
+        .drop_duplicates(["job_id", "carrier_id"])
+    )
+
+    # Dense (jobs x carriers) matrices; missing pairs come out as NaN
+    ptime = df.pivot(index="job_id", columns="carrier_id", values="p90_time_min")
+    hours = df.pivot(index="job_id", columns="carrier_id", values="carrier_hours_worked")
+    jobs = ptime.index.to_numpy()
+    carriers = ptime.columns.to_numpy()
+    ptime = ptime.to_numpy(dtype=np.float64)
+    hours = hours.to_numpy(dtype=np.float64)
+
+    # Check work-hour constraint (NaN pairs fail it too)
+    feasible = hours + ptime / 60.0 <= max_hours
+
+    # float32 only for the solver; reported times come from ptime
+    cost = np.where(feasible, ptime, INFEASIBLE_COST).astype(np.float32)
+
+    # One carrier per job, minimum total time over all jobs
+    rows, cols = linear_sum_assignment(cost)
+    matched = feasible[rows, cols]
+
+    rows, cols = rows[matched], cols[matched]
+
+    # One row per job, built column-wise; unassigned jobs get a reason
+    carrier_id = np.full(len(jobs), None, dtype=object)
+    carrier_id[rows] = carriers[cols]
+    p90_time_min = np.full(len(jobs), np.nan)
+    p90_time_min[rows] = ptime[rows, cols]
+    reason = np.full(len(jobs), "No eligible carriers under 9-hour limit", dtype=object)
+    reason[rows] = None
+
+    return pd.DataFrame({
+        "job_id": jobs,
+        "carrier_id": carrier_id,
+        "p90_time_min": p90_time_min,
+        "reason": reason,
+    })
 
 
 # ---------------------------------------------------------
@@ -161,5 +176,4 @@ if __name__ == "__main__":
     results = assign_jobs(df)
 
     print("\n=== FINAL ASSIGNMENTS ===")
-    for r in results:
-        print(r)
+    print(results.to_string(index=False))
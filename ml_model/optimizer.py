@@ -1,9 +1,9 @@
 import time
-start = time.time()
 import argparse
 import json
 import pandas as pd
 import numpy as np
+from scipy.optimize import linear_sum_assignment
 from datetime import datetime
 from pathlib import Path
 
@@ -18,6 +18,9 @@ CARRIER_HOURS = {
     "C5": 10.0,
 }
 
+# Finite stand-in for "not allowed" so the LAP solver stays well-behaved
+INFEASIBLE_COST = 1e12
+
 # -------------------------------------------------------
 # Utilities
 # -------------------------------------------------------
@@ -32,57 +35,83 @@ def to_python(obj):
 
 
 # -------------------------------------------------------
-# Core optimization logic (UNCHANGED)
+# Core optimization logic
 # -------------------------------------------------------
 def assign_jobs(df: pd.DataFrame, max_hours=9.0):
-    assignments = []
-    available_carriers = set(df["carrier_id"].unique())
-
-    for job_id, job_group in df.groupby("job_id"):
+    # A (job, carrier) pair may appear more than once: keep its fastest
+    # eligible row so time and hours stay paired
+    can_work = (df["carrier_hours_worked"] + df["p90_time_min"] / 60.0) <= max_hours
+    df = (
+        df.assign(_cannot_work=~can_work)
+        .sort_values(["_cannot_work", "p90_time_min"], kind="stable")
+        .drop_duplicates(["job_id", "carrier_id"])
+    )
 
-        job_group = job_group[
-            job_group["carrier_id"].isin(available_carriers)
-        ].copy()
+    # Dense (jobs x carriers) matrices; missing pairs come out as NaN
+    ptime = df.pivot(index="job_id", columns="carrier_id", values="p90_time_min")
+    hours = df.pivot(
+        index="job_id", columns="carrier_id", values="carrier_hours_worked"
+    )
+    return solve_assignment(
+        ptime.index.to_numpy(),
+        ptime.columns.to_numpy(),
+        ptime.to_numpy(dtype=np.float64),
+        hours.to_numpy(dtype=np.float64),
+        max_hours,
+    )
 
-        job_group["can_work"] = (
-            job_group["carrier_hours_worked"]
-            + (job_group["p90_time_min"] / 60.0)
-        ) <= max_hours
 
-        valid = job_group[job_group["can_work"]]
+def solve_assignment(jobs, carriers, ptime, hours, max_hours=9.0):
+    """Match jobs to carriers given dense (jobs x carriers) time/hours arrays.
 
-        if valid.empty:
-            assignments.append({
-                "job_id": int(job_id),
-                "carrier_id": None,
-                "reason": "No eligible carriers under 9-hour limit",
-            })
-            continue
+    Returns one row per job; unassigned jobs have a null carrier_id and a
+    reason.
+    """
+    # float32 only for the solver's cost matrix; reported values come from
+    # the float64 inputs
+    feasible = hours + ptime / 60.0 <= max_hours
+    cost = np.where(feasible, ptime, INFEASIBLE_COST).astype(np.float32)
 
-        best_row = valid.loc[valid["p90_time_min"].idxmin()]
+    # Globally optimal one-to-one matching (rectangular LAP)
+    rows, cols = linear_sum_assignment(cost)
+    matched = feasible[rows, cols]
 
-        assignments.append({
-            "job_id": int(best_row["job_id"]),
-            "carrier_id": best_row["carrier_id"],
-            "p90_time_min": float(best_row["p90_time_min"]),
-            "carrier_hours_before": float(best_row["carrier_hours_worked"]),
-        })
+    rows, cols = rows[matched], cols[matched]
 
-        available_carriers.remove(best_row["carrier_id"])
+    # Build result columns directly instead of one dict per job
+    n_jobs = len(jobs)
+    carrier_id = np.full(n_jobs, None, dtype=object)
+    carrier_id[rows] = carriers[cols]
+    p90_time_min = np.full(n_jobs, np.nan)
+    p90_time_min[rows] = ptime[rows, cols]
+    carrier_hours_before = np.full(n_jobs, np.nan)
+    carrier_hours_before[rows] = hours[rows, cols]
+    reason = np.full(n_jobs, "No eligible carriers under 9-hour limit", dtype=object)
+    reason[rows] = None
 
-    return assignments
+    return pd.DataFrame({
+        "job_id": jobs,
+        "carrier_id": carrier_id,
+        "p90_time_min": p90_time_min,
+        "carrier_hours_before": carrier_hours_before,
+        "reason": reason,
+    })
 
 
 # -------------------------------------------------------
 # MAIN
 # -------------------------------------------------------
-def main(csv_path: str, out_dir: str):
+def main(csv_path: str, out_dir: str, verbose: bool = False):
     csv_path = Path(csv_path)
     out_dir = Path(out_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
 
     print(f"[LOAD] Reading predictions from {csv_path}")
-    df = pd.read_csv(csv_path)
+    usecols = ["carrier_id", "predicted_time_min"]
+    if csv_path.suffix == ".parquet":
+        df = pd.read_parquet(csv_path, columns=usecols)
+    else:
+        df = pd.read_csv(csv_path, engine="pyarrow", usecols=usecols)
 
     # ---------------------------------------------------
     # Step 1 — Auto-generate job IDs
@@ -93,10 +122,15 @@ def main(csv_path: str, out_dir: str):
     # ---------------------------------------------------
     # Step 2 — Apply hard-coded carrier hours
     # ---------------------------------------------------
-    df["carrier_id_str"] = df["carrier_id"].astype(str)
-    df["carrier_hours_worked"] = (
-        df["carrier_id_str"].map(CARRIER_HOURS).fillna(0.0)
+    # Look hours up once per distinct carrier, then gather by category code
+    carrier_codes = df["carrier_id"].astype(str).astype("category")
+    hours_lookup = (
+        carrier_codes.cat.categories.to_series()
+        .map(CARRIER_HOURS)
+        .fillna(0.0)
+        .to_numpy(np.float64)
     )
+    df["carrier_hours_worked"] = hours_lookup[carrier_codes.cat.codes.to_numpy()]
 
     # Match Lambda naming
     df["p90_time_min"] = df["predicted_time_min"]
@@ -105,29 +139,62 @@ def main(csv_path: str, out_dir: str):
     # Step 3 — Run optimization
     # ---------------------------------------------------
     print("[OPT] Running assignment optimization...")
-    assignments = assign_jobs(df)
+    t0 = time.perf_counter()
+
+    # Rows come in fixed blocks of carriers_per_job, one block per job. When
+    # every block lists each carrier once, in the same order, the matrices
+    # are a plain reshape; otherwise fall back to pivoting on job_id (which
+    # handles partial blocks and repeated carriers).
+    carrier_ids = df["carrier_id"].to_numpy()
+    if (
+        carriers_per_job
+        and len(df) % carriers_per_job == 0
+        and (carrier_ids.reshape(-1, carriers_per_job)
+             == carrier_ids[:carriers_per_job]).all()
+    ):
+        out_df = solve_assignment(
+            np.arange(len(df) // carriers_per_job),
+            carrier_ids[:carriers_per_job],
+            df["p90_time_min"].to_numpy(np.float64).reshape(-1, carriers_per_job),
+            df["carrier_hours_worked"].to_numpy(np.float64)
+            .reshape(-1, carriers_per_job),
+        )
+    else:
+        out_df = assign_jobs(df)
+    t1 = time.perf_counter()
+    print(f"[OPT] assign_jobs latency: {(t1 - t0) * 1000:.2f} ms")
 
     # ---------------------------------------------------
     # Step 4 — Save output locally
     # ---------------------------------------------------
-    out_df = pd.DataFrame(assignments)
     ts = datetime.utcnow().isoformat().replace(":", "-")
-    out_path = out_dir / f"optimized_{ts}.csv"
+    out_path = out_dir / f"optimized_{ts}.parquet"
 
-    out_df.to_csv(out_path, index=False)
+    out_df.to_parquet(out_path, compression="zstd", index=False)
 
     # ---------------------------------------------------
     # Step 5 — Print summary
     # ---------------------------------------------------
+    if not verbose:
+        unassigned = out_df["carrier_id"].isna().sum()
+        print(
+            f"[DONE] {len(out_df)} assignments, {unassigned} unassigned, "
+            f"saved to {out_path}"
+        )
+        return
+
     print("\n=== Optimization Result ===")
-    print(out_df)
+    print(out_df.to_string())
 
-    print(f"\n[SAVE] Optimized CSV written to: {out_path}")
+    print(f"\n[SAVE] Optimized Parquet written to: {out_path}")
 
     # Optional JSON-style preview (Lambda-like)
     print("\n=== JSON Preview ===")
     print(json.dumps(
-        [{k: to_python(v) for k, v in row.items()} for row in assignments],
+        [
+            {k: None if pd.isna(v) else to_python(v) for k, v in row.items()}
+            for row in out_df.to_dict("records")
+        ],
         indent=2
     ))
 
@@ -140,18 +207,18 @@ if __name__ == "__main__":
     ap.add_argument(
         "--csv",
         required=True,
-        help="Path to prediction CSV (from local inference)",
+        help="Path to prediction CSV or Parquet (from local inference)",
     )
     ap.add_argument(
         "--out_dir",
         default="optimized_local",
-        help="Directory to save optimized CSV",
+        help="Directory to save optimized Parquet",
+    )
+    ap.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Print the full result table and JSON preview",
     )
 
     args = ap.parse_args()
-    main(args.csv, args.out_dir)
-
-
-end = time.time()
-
-print(f"\nRaw inference latency: {(end - start) * 1000:.2f} ms")
\ No newline at end of file
+    main(args.csv, args.out_dir, args.verbose)
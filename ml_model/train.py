@@ -51,7 +51,7 @@ def main():
         "departure_hour",
     ]
 
-    X = df[feature_cols]
+    X = df[feature_cols].astype(np.float32)
 
     # LOG-transform target for stability
     y = np.log1p(df["duration_sec"])
@@ -63,10 +63,17 @@ def main():
         X, y, test_size=0.2, random_state=42
     )
 
+    # Early stopping gets its own split so X_val stays held out for the MAE
+    X_train, X_es, y_train, y_es = train_test_split(
+        X_train, y_train, test_size=0.1, random_state=42
+    )
+
     # ------------------------------
     # 4. Train model (XGBoost)
     # ------------------------------
-    print("[TRAIN] Training XGBoost model...")
+    # Set XGB_DEVICE=cuda to build histograms on the GPU
+    device = os.environ.get("XGB_DEVICE", "cpu")
+    print(f"[TRAIN] Training XGBoost model on {device}...")
 
     model = XGBRegressor(
         n_estimators=500,
@@ -75,10 +82,15 @@ def main():
         subsample=0.8,
         colsample_bytree=0.8,
         tree_method="hist",
-        objective="reg:squarederror"
+        device=device,
+        objective="reg:squarederror",
+        eval_metric="mae",
+        early_stopping_rounds=20,
     )
 
-    model.fit(X_train, y_train)
+    # Stop once early-stopping MAE stops improving
+    model.fit(X_train, y_train, eval_set=[(X_es, y_es)], verbose=False)
+    print(f"[TRAIN] Best iteration: {model.best_iteration}")
 
     # ------------------------------
     # 5. Evaluate
@@ -89,13 +101,26 @@ def main():
     mae = mean_absolute_error(true_vals, preds)
     print(f"[VAL] MAE: {mae:.2f} seconds")
 
+    # Keep only the trees up to the early-stopping best iteration
+    booster = model.get_booster()[: model.best_iteration + 1]
+
+    # Feature audit on the saved trees: a near-zero share of total gain
+    # means the column can be dropped
+    gain = booster.get_score(importance_type="total_gain")
+    total_gain = sum(gain.values())
+    for col in feature_cols:
+        share = gain.get(col, 0.0) / total_gain if total_gain else 0.0
+        print(f"[GAIN] {col:<15} {share:6.2%}")
+    if gain.get("bearing", 0.0) < 0.01 * total_gain:
+        print("[GAIN] bearing below 1% of total gain - candidate to drop")
+
     # ------------------------------
     # 6. Save model locally
     # ------------------------------
     os.makedirs("model_local", exist_ok=True)
     os.makedirs("model_local", exist_ok=True)
     path = "model_local/travel_time_xgb_2.json"
-    model.get_booster().save_model(path)
+    booster.save_model(path)
     print(f"[SAVE] Model saved to: {path}")
     end = time.time()
 
@@ -0,0 +1,25 @@
+"""Ahead-of-time build of the spatial feature kernel.
+
+Run ``python _features_aot.py`` from this directory at deploy time. It writes
+the ``features_aot`` extension module next to features.py, which then uses it
+in place of the Numba JIT kernel (no compilation on cold start, and Numba is
+not needed at runtime).
+"""
+import os
+
+from numba.pycc import CC
+
+from features import _spatial_features
+
+cc = CC("features_aot")
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+# origin_lat, origin_lng, dest_lat, dest_lng in; five float32 columns out
+cc.export(
+    "compute",
+    "void(f8[:], f8[:], f8[:], f8[:], f4[:], f4[:], f4[:], f4[:], f4[:])",
+)(_spatial_features)
+
+
+if __name__ == "__main__":
+    cc.compile()
@@ -1,13 +1,160 @@
+import math
+
 import numpy as np
 import pandas as pd
 
+try:
+    import numba
+    _prange = numba.prange
+except ImportError:  # plain NumPy path below still works
+    numba = None
+    _prange = range
+
+# Precompiled kernel built by _features_aot.py, if it has been shipped
+try:
+    from .features_aot import compute as _compute_features_aot
+except ImportError:
+    _compute_features_aot = None
+
+
+R = 6371  # km
+
+# The AOT kernel is serial (pycc compiles prange as range): use it for small
+# inference batches and let the parallel JIT kernel take larger frames
+_AOT_MAX_ROWS = 10_000
+
+# 0/1 lookup tables indexed by hour-of-day and weekday
+_PEAK_LUT = np.zeros(24, dtype=np.int8)
+_PEAK_LUT[[7, 8, 9, 16, 17, 18]] = 1
+_WKND_LUT = np.array([0, 0, 0, 0, 0, 1, 1], dtype=np.int8)
+
+# Hour-of-day encodings, looked up instead of evaluated per row
+HOUR_SIN = np.sin(2 * np.pi * np.arange(24) / 24).astype(np.float32)
+HOUR_COS = np.cos(2 * np.pi * np.arange(24) / 24).astype(np.float32)
+
 
 def add_basic_features(df: pd.DataFrame) -> pd.DataFrame:
     """Generate rich feature set for travel-time regression."""
-    
-    # --- Distance ---
-    R = 6371  # km
+    n = len(df)
+    if _compute_features_aot is not None and (
+        n <= _AOT_MAX_ROWS or _compute_features_numba is None
+    ):
+        kernel = _compute_features_aot
+    elif _compute_features_numba is not None:
+        kernel = _compute_features_numba
+    else:
+        return _add_basic_features_numpy(df)
+
+    # Kernel math runs in float64; results are stored as float32
+    dist = np.empty(n, dtype=np.float32)
+    dlog = np.empty(n, dtype=np.float32)
+    lat_diff = np.empty(n, dtype=np.float32)
+    lng_diff = np.empty(n, dtype=np.float32)
+    bearing = np.empty(n, dtype=np.float32)
+
+    kernel(
+        df["origin_lat"].to_numpy(np.float64),
+        df["origin_lng"].to_numpy(np.float64),
+        df["dest_lat"].to_numpy(np.float64),
+        df["dest_lng"].to_numpy(np.float64),
+        dist, dlog, lat_diff, lng_diff, bearing,
+    )
+
+    df["distance_km"] = dist
+    df["bearing"] = bearing
+    df["lat_diff"] = lat_diff
+    df["lng_diff"] = lng_diff
+    _add_time_features(df)
+    df["distance_log"] = dlog
+
+    return df
+
+
+def _add_time_features(df: pd.DataFrame) -> None:
+    """is_peak, is_weekend, hour_sin, hour_cos via table lookups.
+
+    Whole hours 0-23 use the tables. Any other value (fractional, NaN or out
+    of range) falls back to the direct trig formula and is never peak, and a
+    weekday outside whole 0-6 is never weekend, matching the previous
+    isin/np.sin behaviour.
+    """
+    hour = df["departure_hour"].to_numpy(dtype=np.float64, na_value=np.nan)
+    in_table = (hour >= 0) & (hour <= 23) & (hour == np.floor(hour))
+    idx = np.zeros(len(hour), dtype=np.int64)
+    idx[in_table] = hour[in_table]
 
+    hour_sin = HOUR_SIN[idx]
+    hour_cos = HOUR_COS[idx]
+    if not in_table.all():
+        off = ~in_table
+        hour_sin[off] = np.sin(2 * np.pi * hour[off] / 24)
+        hour_cos[off] = np.cos(2 * np.pi * hour[off] / 24)
+
+    # Same rule for weekday: anything but a whole 0-6 is not a weekend
+    weekday = df["weekday"].to_numpy(dtype=np.float64, na_value=np.nan)
+    wd_in_table = (weekday >= 0) & (weekday <= 6) & (weekday == np.floor(weekday))
+    wd_idx = np.zeros(len(weekday), dtype=np.int64)
+    wd_idx[wd_in_table] = weekday[wd_in_table]
+
+    df["is_peak"] = np.where(in_table, _PEAK_LUT[idx], 0).astype(np.int8)
+    df["is_weekend"] = np.where(wd_in_table, _WKND_LUT[wd_idx], 0).astype(np.int8)
+    df["hour_sin"] = hour_sin
+    df["hour_cos"] = hour_cos
+
+
+def _spatial_features(
+    olat, olng, dlat_in, dlng_in,
+    out_dist, out_dlog, out_latd, out_lngd, out_bear,
+):
+    """Single fused pass over rows writing the spatial feature columns.
+
+    Plain Python source shared by the JIT (below) and AOT
+    (_features_aot.py) builds; never called uncompiled.
+    """
+    for i in _prange(olat.shape[0]):
+        # --- Distance ---
+        lat1 = math.radians(olat[i])
+        lon1 = math.radians(olng[i])
+        lat2 = math.radians(dlat_in[i])
+        lon2 = math.radians(dlng_in[i])
+
+        dlat = lat2 - lat1
+        dlon = lon2 - lon1
+
+        a = (math.sin(dlat / 2) ** 2
+             + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2)
+        dist = R * 2 * math.asin(math.sqrt(a))
+        out_dist[i] = dist
+        out_dlog[i] = math.log1p(dist)
+
+        # --- Bearing (direction angle) ---
+        y = math.sin(dlon) * math.cos(lat2)
+        x = (math.cos(lat1) * math.sin(lat2)
+             - math.sin(lat1) * math.cos(lat2) * math.cos(dlon))
+        b = math.degrees(math.atan2(y, x))
+        out_bear[i] = 0.0 if math.isnan(b) else b
+
+        # --- Basic diffs ---
+        out_latd[i] = abs(olat[i] - dlat_in[i])
+        out_lngd[i] = abs(olng[i] - dlng_in[i])
+
+
+if numba is not None:
+    # All fastmath flags except nnan/ninf, so NaN coordinates still map to a
+    # bearing of 0 like the NumPy path.
+    _compute_features_numba = numba.njit(
+        parallel=True,
+        fastmath={"nsz", "arcp", "contract", "afn", "reassoc"},
+        cache=True,
+    )(_spatial_features)
+else:
+    _compute_features_numba = None
+
+
+def _add_basic_features_numpy(df: pd.DataFrame) -> pd.DataFrame:
+    """Vectorised NumPy fallback used when no compiled kernel is available."""
+
+    # --- Distance ---
     lat1 = np.radians(df["origin_lat"])
     lon1 = np.radians(df["origin_lng"])
     lat2 = np.radians(df["dest_lat"])
@@ -18,25 +165,21 @@ def add_basic_features(df: pd.DataFrame) -> pd.DataFrame:
 
     a = np.sin(dlat/2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon/2)**2
     c = 2 * np.arcsin(np.sqrt(a))
-    df["distance_km"] = R * c
+    distance_km = R * c
+    df["distance_km"] = distance_km.astype(np.float32)
 
     # --- Bearing (direction angle) ---
     y = np.sin(dlon) * np.cos(lat2)
     x = np.cos(lat1)*np.sin(lat2) - np.sin(lat1)*np.cos(lat2)*np.cos(dlon)
-    df["bearing"] = np.degrees(np.arctan2(y, x))
-    df["bearing"] = df["bearing"].fillna(0)
+    df["bearing"] = np.degrees(np.arctan2(y, x)).fillna(0).astype(np.float32)
 
     # --- Basic diffs ---
-    df["lat_diff"] = np.abs(df["origin_lat"] - df["dest_lat"])
-    df["lng_diff"] = np.abs(df["origin_lng"] - df["dest_lng"])
+    df["lat_diff"] = np.abs(df["origin_lat"] - df["dest_lat"]).astype(np.float32)
+    df["lng_diff"] = np.abs(df["origin_lng"] - df["dest_lng"]).astype(np.float32)
 
     # --- Time features ---
-    df["is_peak"] = df["departure_hour"].isin([7, 8, 9, 16, 17, 18]).astype(int)
-    df["is_weekend"] = df["weekday"].isin([5, 6]).astype(int)
-
-    df["hour_sin"] = np.sin(2 * np.pi * df["departure_hour"] / 24)
-    df["hour_cos"] = np.cos(2 * np.pi * df["departure_hour"] / 24)
+    _add_time_features(df)
 
-    df["distance_log"] = np.log1p(df["distance_km"])
+    df["distance_log"] = np.log1p(distance_km).astype(np.float32)
 
     return df
@@ -3,7 +3,7 @@ import boto3
 import pandas as pd
 import numpy as np
 from datetime import datetime
-from io import StringIO
+from io import BytesIO
 
 s3 = boto3.client("s3")
 
@@ -21,17 +21,20 @@ def to_python(obj):
     return obj
 
 
-# Fetch the most recent prediction CSV from S3
+# Fetch the most recent prediction file (CSV or Parquet) from S3
 def get_latest_csv():
-    """Return the key of the most recent CSV in predictions/."""
+    """Return the key of the most recent CSV/Parquet in predictions/."""
     resp = s3.list_objects_v2(Bucket=BUCKET, Prefix=PREDICTIONS_PREFIX)
 
     if "Contents" not in resp:
         raise FileNotFoundError("No files found in predictions/ folder.")
 
-    csvs = [obj for obj in resp["Contents"] if obj["Key"].endswith(".csv")]
+    csvs = [
+        obj for obj in resp["Contents"]
+        if obj["Key"].endswith((".csv", ".parquet"))
+    ]
     if not csvs:
-        raise FileNotFoundError("No CSV files found in predictions/ folder.")
+        raise FileNotFoundError("No CSV/Parquet files found in predictions/ folder.")
 
     latest = sorted(csvs, key=lambda x: x["LastModified"], reverse=True)[0]
     return latest["Key"]
@@ -47,44 +50,46 @@ def assign_jobs(df: pd.DataFrame, max_hours=9.0):
           * Check hours constraint
           * Select the smallest p90 time
           * Remove selected carrier (1 job per carrier)
-    """
-
-    assignments = []
-    available_carriers = set(df["carrier_id"].unique())
-
-    for job_id, job_group in df.groupby("job_id"):
-
-        # Only carriers still unassigned
-        job_group = job_group[job_group["carrier_id"].isin(available_carriers)].copy()
 
-        # Hours constraint
-        job_group["can_work"] = (
-            job_group["carrier_hours_worked"] + (job_group["p90_time_min"] / 60.0)
-        ) <= max_hours
-
-        valid = job_group[job_group["can_work"]]
+    Returns one row per job: job_id, carrier_id, p90_time_min, reason.
+    """
 
-        if valid.empty:
-            assignments.append({
-                "job_id": int(job_id),
-                "carrier_id": None,
-                "reason": "No eligible carriers under 9-hour limit"
-            })
+    # One (job_id, carrier_id, p90_time_min, reason) tuple per job
+    assignments = [None] * df["job_id"].nunique()
+
+    # Track free carriers as a boolean mask indexed by carrier code
+    # (codes live on a copy so the caller's frame is left untouched)
+    carrier_cat = df["carrier_id"].astype("category")
+    work = df.assign(carrier_code=carrier_cat.cat.codes.to_numpy(np.int32))
+    available = np.ones(len(carrier_cat.cat.categories), dtype=bool)
+
+    cols = ["carrier_id", "carrier_code", "carrier_hours_worked", "p90_time_min"]
+    for i, (job_id, job_group) in enumerate(work.groupby("job_id")[cols]):
+        carrier_ids = job_group["carrier_id"].to_numpy()
+        codes = job_group["carrier_code"].to_numpy()
+        hours = job_group["carrier_hours_worked"].to_numpy()
+        ptime = job_group["p90_time_min"].to_numpy()
+
+        # Hours constraint, only carriers still unassigned
+        feasible = ((hours + ptime / 60.0) <= max_hours) & available[codes]
+
+        if not feasible.any():
+            assignments[i] = (
+                int(job_id), None, None, "No eligible carriers under 9-hour limit"
+            )
             continue
 
         # Choose carrier with minimum time
-        best_row = valid.loc[valid["p90_time_min"].idxmin()]
+        idx = np.argmin(np.where(feasible, ptime, np.inf))
 
-        assignments.append({
-            "job_id": int(best_row["job_id"]),
-            "carrier_id": best_row["carrier_id"],
-            "p90_time_min": float(best_row["p90_time_min"])
-        })
+        assignments[i] = (int(job_id), carrier_ids[idx], float(ptime[idx]), None)
 
         # Remove this carrier (one job only)
-        available_carriers.remove(best_row["carrier_id"])
+        available[codes[idx]] = False
 
-    return assignments
+    return pd.DataFrame(
+        assignments, columns=["job_id", "carrier_id", "p90_time_min", "reason"]
+    )
 
 # Main Lambda Handler
 
@@ -93,7 +98,10 @@ def lambda_handler(event, context):
     try:
         key = get_latest_csv()
         obj = s3.get_object(Bucket=BUCKET, Key=key)
-        df = pd.read_csv(obj["Body"])
+        if key.endswith(".parquet"):
+            df = pd.read_parquet(BytesIO(obj["Body"].read()))
+        else:
+            df = pd.read_csv(obj["Body"])
     except Exception as e:
         return {
             "statusCode": 500,
@@ -110,7 +118,7 @@ def lambda_handler(event, context):
 
     # Step 4  Run optimization
     try:
-        assignments = assign_jobs(df)
+        out_df = assign_jobs(df)
     except Exception as e:
         return {
             "statusCode": 500,
@@ -118,11 +126,10 @@ def lambda_handler(event, context):
         }
 
     # Step 5  Save optimized results to S3
-    out_df = pd.DataFrame(assignments)
-    out_key = f"{OPTIMIZED_PREFIX}optimized_{datetime.utcnow().isoformat()}.csv"
+    out_key = f"{OPTIMIZED_PREFIX}optimized_{datetime.utcnow().isoformat()}.parquet"
 
-    buf = StringIO()
-    out_df.to_csv(buf, index=False)
+    buf = BytesIO()
+    out_df.to_parquet(buf, compression="zstd", index=False)
 
     try:
         s3.put_object(Bucket=BUCKET, Key=out_key, Body=buf.getvalue())
@@ -132,7 +139,7 @@ def lambda_handler(event, context):
             "body": json.dumps({"error": f"Failed writing optimized output: {str(e)}"})
         }
 
-    # Step 6  DELETE the original CSV file
+    # Step 6  DELETE the original predictions file
     try:
         s3.delete_object(Bucket=BUCKET, Key=key)
         deleted = True
@@ -146,8 +153,8 @@ def lambda_handler(event, context):
         "body": json.dumps({
             "optimized_s3_key": out_key,
             "assignments": [
-                {k: to_python(v) for k, v in row.items()}
-                for row in assignments
+                {k: None if pd.isna(v) else to_python(v) for k, v in row.items()}
+                for row in out_df.to_dict("records")
             ],
             "deleted_input_file": deleted,
             "deleted_key": key